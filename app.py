@@ -1,13 +1,15 @@
-
 import os
+import sys
 import time
+import atexit
 import logging
-import schedule
+import argparse
 import datetime
-from src.Database import Database
-from src.Scheduler import Scheduler
 from dotenv import load_dotenv
 
+# Everything else (Selenium, psycopg2, ...) is imported by the commands that need it,
+# so that a cron or job runner invocation starts fast
+
 
 # Load environment variables from .env file
 load_dotenv()
@@ -21,25 +23,44 @@ DB_DATABASE = os.environ.get('DB_DATABASE', 'presalebot')
 DB_USER = os.environ.get('DB_USER', 'postgres')
 DB_PASSWORD = os.environ.get('DB_PASSWORD', 'presalebot')
 PORT = os.environ.get('PORT', '5432')
+ARCHIVE_DIRECTORY = os.environ.get('ARCHIVE_DIRECTORY', 'archive')
+ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', str(DELETE_FILES_OLDER_THAN_DAYS)))        # default same as logs
+SOLANA_RPC_URL = os.environ.get('SOLANA_RPC_URL', 'https://api.mainnet-beta.solana.com')
+RPC_CACHE_TTL = int(os.environ.get('RPC_CACHE_TTL', '600'))        # default 10 minutes
+PAGE_DEADLINE = int(os.environ.get('PAGE_DEADLINE', '180'))        # default 3 minutes
+RUN_DEADLINE = int(os.environ.get('RUN_DEADLINE', '3000'))        # default 50 minutes
+ADAPTIVE_CADENCE = os.environ.get('ADAPTIVE_CADENCE', 'true').lower() == 'true'        # default enabled
+CADENCE_MIN_INTERVAL = int(os.environ.get('CADENCE_MIN_INTERVAL', '10'))        # default 10 minutes
+CADENCE_MAX_INTERVAL = int(os.environ.get('CADENCE_MAX_INTERVAL', '120'))        # default 2 hours
+CADENCE_STATE_FILE = os.environ.get('CADENCE_STATE_FILE', 'db/cadence.json')
+LOG_ROTATE = os.environ.get('LOG_ROTATE', 'size')        # 'size' or 'time'
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', str(10 * 1024 * 1024)))        # default 10 MB
+LOG_ROTATE_WHEN = os.environ.get('LOG_ROTATE_WHEN', 'midnight')
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', '10'))
+LOG_SAMPLE_EVERY = int(os.environ.get('LOG_SAMPLE_EVERY', '100'))        # keep 1 in 100 repeated field misses
 
+# Exit status of the commands
+EXIT_OK = 0
+EXIT_ERROR = 1              # 2 is used by argparse for usage errors
+EXIT_DB_UNAVAILABLE = 3
+EXIT_PARTIAL = 4            # some pages timed out or failed
 
 
 
 def config_log():
-    # Configure logging
-    log_directory = "logs"
-    if not os.path.exists(log_directory):
-        os.makedirs(log_directory)
-
-    # Create the full path to the log file
-    formatted_datetime = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_filepath = os.path.join(log_directory, f"log_{formatted_datetime}.txt")
-
-    logging.basicConfig(filename=log_filepath, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Configure logging, records are written as JSON lines by a background thread
+    # to logs/presalebot.log, rotated by size or time and gzip compressed
+    from src.AsyncLogging import config_async_logging
+    listener = config_async_logging(log_directory="logs", level=logging.INFO, rotate=LOG_ROTATE,
+                                    max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                                    when=LOG_ROTATE_WHEN, sample_every=LOG_SAMPLE_EVERY)
+    atexit.register(listener.stop)
     logging.info("Log File Created Successfully")
     return logging
 
-def config_db(logging):
+def config_db(logging, migrate=True):
+    # migrate: add the missing columns and indexes, skipped by the commands that must not write
+    from src.Database import Database
     db_directory = "db"
     if not os.path.exists(db_directory):
         os.makedirs(db_directory)
@@ -50,6 +71,8 @@ def config_db(logging):
     if status == False:
         logging.error("Error connecting to database")
         return None
+    if migrate:
+        db.migrate()
     return db
 
 def delete_old_logs():
@@ -65,11 +88,11 @@ def delete_old_logs():
     # Iterate over files in the logs directory
     for filename in filelist:
         filepath = os.path.join(log_directory, filename)
-        # Check if the file is a regular file
-        if os.path.isfile(filepath):
+        # Check if the file is a regular file, the active log file is bounded by its rotation
+        if os.path.isfile(filepath) and filename != "presalebot.log":
             try:
-                # Get the creation time of the file
-                creation_time = datetime.datetime.fromtimestamp(os.path.getctime(filepath))
+                # Get the last modification time of the file (rotated files are not modified any more)
+                creation_time = datetime.datetime.fromtimestamp(os.path.getmtime(filepath))
                 # Calculate the difference in days
                 delta_days = (current_date - creation_time).days
                 # Check if the file is older than 30 days
@@ -80,37 +103,238 @@ def delete_old_logs():
                     logging.info(f"Deleted old log file: {filename}")
                     
             except Exception as e:
-                logging.error('Error deleting old log file:', e)
+                logging.error('Error deleting old log file: %s', e)
 
     logging.info('........................................................')
 
+def delete_old_pages(archive):
+    logging.info('............Delete Archived Pages Scheduler.............')
+    try:
+        archive.delete_older_than(ARCHIVE_RETENTION_DAYS)
+    except Exception as e:
+        logging.error('Error deleting old archived pages: %s', e)
+
+def config_scheduler(db, dry_run=False):
+    from src.Scheduler import Scheduler
+    from src.PageArchive import PageArchive
+    from src.TokenEnricher import TokenEnricher
+    from src.Watchdog import Watchdog
+
+    # Archive of the raw project pages, used for offline re-extraction
+    archive = PageArchive(logging=logging, directory=ARCHIVE_DIRECTORY)
+
+    # On-chain enrichment of the token and pool addresses, disabled when SOLANA_RPC_URL is empty
+    enricher = TokenEnricher(logging=logging, rpc_url=SOLANA_RPC_URL, cache_ttl=RPC_CACHE_TTL) if SOLANA_RPC_URL else None
+
+    # Hard deadlines per page and per run, wedged browser sessions are killed and replaced
+    watchdog = Watchdog(logging=logging, page_deadline=PAGE_DEADLINE, run_deadline=RUN_DEADLINE)
+
+    # Set up pinksale scheduler
+    scheduler = Scheduler(logging=logging, db=db, archive=archive, enricher=enricher, watchdog=watchdog, dry_run=dry_run)
+    return scheduler, archive
+
+def summary_status(summary):
+    if summary.get('errors'):
+        return EXIT_ERROR
+    if summary.get('timed_out') or summary.get('failed'):
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+def serve(scheduler, archive):
+    import schedule
+    from src.CadenceController import CadenceController
+
+    def run_source(source):
+        # Scrap one source, then reschedule it at the interval given by its observed arrival rate
+        summary = scheduler.run(sources=[source])
+
+        # A failed run (browser or listing unavailable) is not a quiet period, keep the previous interval
+        stats = scheduler.source_stats.get(source)
+        if stats is None or summary['errors']:
+            logging.error(f"{source} run failed, not observed by the cadence")
+        else:
+            cadence.observe(source, stats['links'], stats['start_times'])
+        schedule_source(source, cadence.next_interval(source))
+        return schedule.CancelJob
+
+    def schedule_source(source, interval):
+        logging.info(f"Next {source} run in {interval} seconds")
+        schedule.every(interval).seconds.do(run_source, source)
+
+    # Schedule the delete log files and archived pages jobs to run every 12 hours
+    schedule.every(DELETE_SERVICE_INTERVAL).hours.do(delete_old_logs)
+    schedule.every(DELETE_SERVICE_INTERVAL).hours.do(delete_old_pages, archive)
+
+    if ADAPTIVE_CADENCE:
+        # Each source is rescheduled after every run, between the configured bounds
+        cadence = CadenceController(logging=logging, state_file=CADENCE_STATE_FILE,
+                                    min_interval=CADENCE_MIN_INTERVAL * 60, max_interval=CADENCE_MAX_INTERVAL * 60,
+                                    initial_interval=SCRAPPING_INTERVAL * 3600)
+        for source in ('solanapad', 'pinksale'):
+            schedule_source(source, cadence.next_interval(source))
+    else:
+        # Schedule the pinksale scrapping job to Run the every 4 hours
+        schedule.every(SCRAPPING_INTERVAL).hours.do(scheduler.run)
+
+    error_message = f"System Deployed Successfully, Interval: {SCRAPPING_INTERVAL}"
+    logging.info(error_message)
+    # Run indefinitely
+    while True:
+        schedule.run_pending()
+        time.sleep(1)
+
+def scrape_command(args):
+    # run, scrape and scrape-urls: config logging, database and scheduler, then scrap
+    config_log()
+
+    # Config Database as well as the mapping directory
+    db = config_db(logging, migrate=not args.dry_run)
+    if db == None:
+        logging.error("Error connecting to database")
+        print("Error connecting to database", file=sys.stderr)
+        return EXIT_DB_UNAVAILABLE
+    logging.info("Database Connected Successfully")
+
+    scheduler, archive = config_scheduler(db, dry_run=args.dry_run)
+
+    if args.command == 'run' and not args.once:
+        serve(scheduler, archive)
+    elif args.command == 'scrape-urls':
+        with open(args.file, 'r') as file:
+            urls = [line.strip() for line in file if line.strip() and not line.startswith('#')]
+        summary = scheduler.scrape_urls(urls)
+    else:
+        sources = [args.source] if args.command == 'scrape' else None
+        summary = scheduler.run(sources=sources)
+
+    print(f"{summary['new_projects']} new projects, {len(summary['timed_out'])} timed out, {len(summary['failed'])} failed, {len(summary['errors'])} errors")
+    return summary_status(summary)
+
+def reextract_command(args):
+    import json
+    from src.PageArchive import PageArchive
+    from src.Reextractor import Reextractor
+
+    logging.basicConfig(level=logging.INFO)
+    since = None
+    if args.days is not None:
+        since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=args.days)
+
+    reextractor = Reextractor(logging, PageArchive(logging, directory=args.archive_dir), processes=args.processes)
+    errors = 0
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in reextractor.run(source=args.source, since=since, url=args.url):
+            errors += 'error' in result
+            output.write(json.dumps(result) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return EXIT_PARTIAL if errors else EXIT_OK
+
+def bench_command(args):
+    # Time the current field maps over the archived pages, without a browser or database
+    from src.PageArchive import PageArchive
+    from src.Reextractor import Reextractor
+
+    logging.basicConfig(level=logging.WARNING)
+    reextractor = Reextractor(logging, PageArchive(logging, directory=args.archive_dir), processes=args.processes)
+
+    started = time.perf_counter()
+    pages = 0
+    errors = 0
+    found = {}
+    for result in reextractor.run(source=args.source):
+        pages += 1
+        errors += 'error' in result
+        for field, value in result.get('data', {}).items():
+            # False and empty values (e.g. live_status of a page where nothing matched) are not found fields
+            found[field] = found.get(field, 0) + bool(value)
+        if args.limit and pages >= args.limit:
+            break
+    elapsed = time.perf_counter() - started
+
+    print(f"{pages} pages in {elapsed:.2f}s ({pages / elapsed if elapsed else 0:.1f} pages/s) on {reextractor.processes} processes, {errors} errors")
+    for field, count in sorted(found.items()):
+        print(f"  {field}: {count}/{pages}")
+    return EXIT_PARTIAL if errors else EXIT_OK
+
+def export_command(args):
+    from src.Exporter import Exporter
+
+    logging.basicConfig(level=logging.INFO)
+    # Read only, the schema is migrated by the scrapper
+    db = config_db(logging, migrate=False)
+    if db == None:
+        print("Error connecting to database", file=sys.stderr)
+        return EXIT_DB_UNAVAILABLE
+    try:
+        exported = Exporter(logging, db, directory=args.directory, file_format=args.format, batch_size=args.batch_size,
+                            safety_lag=args.safety_lag).run()
+    finally:
+        db.close()
+    print(f"{exported} projects exported")
+    return EXIT_OK
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="app.py", description="PreSaleBot, scrapper of crypto presales")
+    parser.add_argument('--dry-run', action='store_true', help="scrap without writing to the database")
+    subparsers = parser.add_subparsers(dest='command')
 
+    run_parser = subparsers.add_parser('run', help="scrap all the sources on schedule (default)")
+    run_parser.add_argument('--once', action='store_true', help="scrap all the sources once and exit")
+    run_parser.add_argument('--dry-run', action='store_true', default=argparse.SUPPRESS, help="scrap without writing to the database")
+    run_parser.set_defaults(func=scrape_command)
 
-# Config Logging
-logging = config_log()
+    scrape_parser = subparsers.add_parser('scrape', help="scrap one source once")
+    scrape_parser.add_argument('--source', required=True, choices=['pinksale', 'solanapad'])
+    scrape_parser.add_argument('--dry-run', action='store_true', default=argparse.SUPPRESS, help="scrap without writing to the database")
+    scrape_parser.set_defaults(func=scrape_command)
 
-# Config Database as well as the mapping directory
-db = config_db(logging)
+    urls_parser = subparsers.add_parser('scrape-urls', help="re-scrap the project URLs listed in a file, one per line")
+    urls_parser.add_argument('file')
+    urls_parser.add_argument('--dry-run', action='store_true', default=argparse.SUPPRESS, help="scrap without writing to the database")
+    urls_parser.set_defaults(func=scrape_command)
 
-if db == None:
-    logging.error("Error connecting to database")
-    exit(1)
+    reextract_parser = subparsers.add_parser('reextract', help="run the field maps over the archived pages")
+    reextract_parser.add_argument('--archive-dir', default=ARCHIVE_DIRECTORY)
+    reextract_parser.add_argument('--source', choices=['pinksale', 'solanapad'])
+    reextract_parser.add_argument('--url', help="only the pages of this project URL")
+    reextract_parser.add_argument('--days', type=int, help="only pages fetched in the last N days")
+    reextract_parser.add_argument('--processes', type=int)
+    reextract_parser.add_argument('--output', help="JSON lines output file (default: stdout)")
+    reextract_parser.set_defaults(func=reextract_command)
 
-logging.info("Database Connected Successfully")
+    bench_parser = subparsers.add_parser('bench', help="time the field maps over the archived pages")
+    bench_parser.add_argument('--archive-dir', default=ARCHIVE_DIRECTORY)
+    bench_parser.add_argument('--source', choices=['pinksale', 'solanapad'])
+    bench_parser.add_argument('--processes', type=int)
+    bench_parser.add_argument('--limit', type=int, help="stop after N pages")
+    bench_parser.set_defaults(func=bench_command)
 
-# Set up pinksale scheduler
-scheduler = Scheduler(logging=logging, db=db)
+    export_parser = subparsers.add_parser('export', help="export new and changed projects to partitioned files")
+    export_parser.add_argument('--directory', default=os.environ.get('EXPORT_DIRECTORY', 'exports'))
+    export_parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    export_parser.add_argument('--batch-size', type=int, default=5000)
+    export_parser.add_argument('--safety-lag', type=int, default=60, help="leave the rows written in the last N seconds for the next export")
+    export_parser.set_defaults(func=export_command)
+    return parser
 
-# Schedule the delete log files job to run every 12 hours
-schedule.every(DELETE_SERVICE_INTERVAL).hours.do(delete_old_logs)
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # No command: scrap on schedule, as before
+    if args.command is None:
+        args = build_parser().parse_args((argv if argv is not None else sys.argv[1:]) + ['run'])
 
-# Schedule the pinksale scrapping job to Run the every 4 hours
-schedule.every(SCRAPPING_INTERVAL).hours.do(scheduler.run)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return EXIT_ERROR
+    except Exception as e:
+        logging.error("Error occurred: %s", e)
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
 
-error_message = f"System Deployed Successfully, Interval: {SCRAPPING_INTERVAL}"
-logging.info(error_message)
-# Run indefinitely
-while True:
-    schedule.run_pending()
-    time.sleep(1)
 
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,3 +26,19 @@ CREATE TABLE IF NOT EXISTS projects (
     scrap_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+
+-- On-chain details of the token and pool, filled by the enrichment stage
+ALTER TABLE projects
+    ADD COLUMN IF NOT EXISTS onchain_verified BOOLEAN,
+    ADD COLUMN IF NOT EXISTS mint_supply NUMERIC(20),       -- raw supply, divide by 10^mint_decimals
+    ADD COLUMN IF NOT EXISTS mint_decimals SMALLINT,
+    ADD COLUMN IF NOT EXISTS mint_authority VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS freeze_authority VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS pool_balance BIGINT,           -- lamports
+    ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP;
+
+-- Last write time of the row, cursor of the incremental export
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
+UPDATE projects SET updated_at = scrap_time WHERE updated_at IS NULL;
+ALTER TABLE projects ALTER COLUMN updated_at SET DEFAULT clock_timestamp();
+CREATE INDEX IF NOT EXISTS projects_updated_at_id_idx ON projects (updated_at, id);
@@ -0,0 +1,128 @@
+import os
+import copy
+import gzip
+import json
+import time
+import queue
+import shutil
+import logging
+import datetime
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'sample_key', None) is not None:
+            entry['sample_key'] = record.sample_key
+            entry['sampled'] = record.sampled
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry)
+
+
+class JsonQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # The default prepare formats the traceback into the message and drops it,
+        # keep the message and the traceback apart for JsonFormatter
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Samples the repetitive records, the ones logged with extra={'sample_key': ...}.
+
+    Per key, the first `burst` records of every `window` seconds are kept, then
+    one in `every`. Kept records carry the number of records they stand for.
+    """
+
+    def __init__(self, burst=5, every=100, window=3600):
+        super().__init__()
+        self.burst = burst
+        self.every = every
+        self.window = window
+        self.counts = {}
+        self.window_started = time.monotonic()
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'sample_key', None)
+        if key is None:
+            return True
+
+        with self.lock:
+            if time.monotonic() - self.window_started > self.window:
+                self.counts = {}
+                self.window_started = time.monotonic()
+            count = self.counts.get(key, 0) + 1
+            self.counts[key] = count
+
+        if count <= self.burst:
+            record.sampled = 1
+            return True
+        if (count - self.burst) % self.every == 0:
+            record.sampled = self.every
+            return True
+        return False
+
+
+def gzip_namer(name):
+    return f"{name}.gz"
+
+
+def gzip_rotator(source, dest):
+    with open(source, 'rb') as file_in, gzip.open(dest, 'wb') as file_out:
+        shutil.copyfileobj(file_in, file_out)
+    os.remove(source)
+
+
+def config_async_logging(log_directory="logs", level=logging.INFO, rotate='size', max_bytes=10 * 1024 * 1024,
+                         backup_count=10, when='midnight', sample_burst=5, sample_every=100):
+    """
+    Configures the root logger to hand records to a queue; a QueueListener thread
+    formats them as JSON lines and writes them to a rotating, gzip compressed file.
+    Returns the listener, which must be stopped on exit to flush the queue.
+    """
+    if not os.path.exists(log_directory):
+        os.makedirs(log_directory)
+    log_filepath = os.path.join(log_directory, "presalebot.log")
+
+    if rotate == 'time':
+        file_handler = TimedRotatingFileHandler(log_filepath, when=when, backupCount=backup_count, utc=True)
+    else:
+        file_handler = RotatingFileHandler(log_filepath, maxBytes=max_bytes, backupCount=backup_count)
+    file_handler.namer = gzip_namer
+    file_handler.rotator = gzip_rotator
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.Queue(-1)
+    queue_handler = JsonQueueHandler(log_queue)
+    # Sample before enqueueing, so that dropped records cost nothing more
+    queue_handler.addFilter(SamplingFilter(burst=sample_burst, every=sample_every))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    return listener
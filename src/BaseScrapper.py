@@ -1,20 +1,82 @@
 
 
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.firefox.service import Service
 
+class SessionExpired(Exception):
+    pass
+
 class BaseScrapper:
-    def __init__(self, logging):
+    source = None
+
+    def __init__(self, logging, archive=None):
+        # Browser sessions are replaced by a new generation when the watchdog kills them
+        self.generation = 0
+        self.bound = threading.local()
         self.driver = None
         self.sec_driver = None
         #self.elements = None
         self.status = None
         self.logging = logging
+        self.archive = archive
         #self.link_ctr = 0
         #self.links = None
 
+    def bind_session(self):
+        # The calling thread may only use the browser sessions of the current generation
+        self.bound.generation = self.generation
+
+    def expire_sessions(self):
+        # Calls bound to the killed sessions fail on their next use of the drivers or status
+        self.generation += 1
+        self._driver = None
+        self._sec_driver = None
+        self._status = None
+
+    def check_session(self, value=None):
+        generation = getattr(self.bound, 'generation', None)
+        if generation is not None and generation != self.generation:
+            # An abandoned call must not keep a session it just started
+            if hasattr(value, 'quit'):
+                try:
+                    value.quit()
+                except Exception:
+                    pass
+            raise SessionExpired(f"Browser session of {self.source} was replaced")
+
+    @property
+    def driver(self):
+        self.check_session()
+        return self._driver
+
+    @driver.setter
+    def driver(self, value):
+        self.check_session(value)
+        self._driver = value
+
+    @property
+    def sec_driver(self):
+        self.check_session()
+        return self._sec_driver
+
+    @sec_driver.setter
+    def sec_driver(self, value):
+        self.check_session(value)
+        self._sec_driver = value
+
+    @property
+    def status(self):
+        self.check_session()
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self.check_session()
+        self._status = value
+
     def start_driver(self):
         if self.status is None:
             options = webdriver.FirefoxOptions()
@@ -24,15 +86,31 @@ class BaseScrapper:
             self.driver = webdriver.Firefox(service=Service(GeckoDriverManager().install()), options=options)
             self.sec_driver = webdriver.Firefox(service=Service(GeckoDriverManager().install()), options=options)
             self.status = True
+        return self.status
+
+    def restart_driver(self):
+        # Start new browser sessions after the previous ones were killed
+        self.stop_driver()
+        BaseScrapper.start_driver(self)
+        return self.status
 
     def get_status(self):
         return self.status
 
     def stop_driver(self):
-        if self.status is True:
-            self.driver.quit()
-            self.sec_driver.quit()
+        if self.status is not None:
+            for driver in (self.driver, self.sec_driver):
+                if driver is None:
+                    continue
+                try:
+                    driver.quit()
+                except Exception as e:
+                    self.logging.error(f"Error quitting browser session: {e}")
             self.logging.info("Selenium successfully disconnected from the website")
+        # The next start_driver opens new sessions, e.g. on the next scheduled run
+        self.driver = None
+        self.sec_driver = None
+        self.status = None
 
     def extract_data(self, tag, xpath, extract_type='text'):
         if self.status is False:
@@ -43,11 +121,32 @@ class BaseScrapper:
                 return element.text.strip()
             elif extract_type == 'text_split':
                 return element.text.strip().split('\n')[0]
+            elif extract_type == 'text_value':
+                lines = element.text.strip().split('\n')
+                return lines[1] if len(lines) > 1 else None
             elif extract_type == 'url':
                 return element.get_attribute('href')
             else:
                 self.logging.error(f"Unknown extract type: {extract_type} at tag: {tag}")
                 return None
         except Exception as e:
-            self.logging.error(f"Error: {e} at tag: {tag}")
+            # Only the first line of the Selenium message, misses of the same tag are sampled
+            message = str(e).strip().split('\n')[0]
+            self.logging.error(f"Error: {type(e).__name__}: {message} at tag: {tag}", extra={'sample_key': f"miss:{self.source}:{tag}"})
+            return None
+
+    def extract_fields(self, data, fields):
+        # Extract every (attribute, tag, xpath, extract_type) of a field map into data
+        for attribute, tag, xpath, extract_type in fields:
+            setattr(data, attribute, self.extract_data(tag=tag, xpath=xpath, extract_type=extract_type))
+        return data
+
+    def archive_page(self, url):
+        # Keep the raw page so that it can be re-extracted later without a browser
+        if self.archive is None:
+            return None
+        try:
+            return self.archive.store(source=self.source, url=url, page_source=self.sec_driver.page_source)
+        except Exception as e:
+            self.logging.error(f"Error archiving page {url}: {e}")
             return None
@@ -0,0 +1,109 @@
+import os
+import re
+import json
+import datetime
+
+START_TIME_PATTERN = re.compile(r'(\d{4})[-./](\d{1,2})[-./](\d{1,2})[ T]+(\d{1,2}):(\d{2})(?::(\d{2}))?')
+
+
+def parse_start_time(text):
+    # Scraped start times look like "2024-04-03 18:00:00 (UTC)" or "2024.04.03 18:00 (UTC)"
+    if not text:
+        return None
+    match = START_TIME_PATTERN.search(text)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second = (int(value or 0) for value in match.groups())
+    try:
+        return datetime.datetime(year, month, day, hour, minute, second, tzinfo=datetime.timezone.utc)
+    except ValueError:
+        return None
+
+
+class CadenceController:
+    """
+    Adaptive polling interval of each source.
+
+    The arrival rate of new listing URLs is learnt from the run history with an
+    exponential moving average; the interval aims at target_new_per_run new URLs
+    per run, between min_interval and max_interval (seconds). The next known
+    start time of an upcoming presale brings the next run forward so that it
+    happens lead_time seconds after the presale goes live.
+    """
+
+    def __init__(self, logging, state_file, min_interval=600, max_interval=7200, initial_interval=3600,
+                 target_new_per_run=1.0, alpha=0.3, lead_time=60, max_seen_urls=5000):
+        self.logging = logging
+        self.state_file = state_file
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.target_new_per_run = target_new_per_run
+        self.alpha = alpha
+        self.lead_time = lead_time
+        self.max_seen_urls = max_seen_urls
+        self.state = self.load()
+
+    def load(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r') as file:
+                return json.load(file)
+        except Exception as e:
+            self.logging.error(f"Error loading cadence state {self.state_file}: {e}")
+            return {}
+
+    def save(self):
+        directory = os.path.dirname(self.state_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(self.state, file)
+        os.replace(tmp_path, self.state_file)
+
+    def observe(self, source, urls, start_times, now=None):
+        # Record one run of source: the listing URLs it saw and the start times of upcoming projects
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        state = self.state.setdefault(source, {'rate': None, 'last_run': None, 'next_start': None, 'seen': []})
+
+        seen = set(state['seen'])
+        new_urls = [url for url in dict.fromkeys(urls) if url and url not in seen]
+        state['seen'] = (state['seen'] + new_urls)[-self.max_seen_urls:]
+
+        # The first run only learns which URLs already exist
+        if state['last_run'] is not None:
+            elapsed = (now - datetime.datetime.fromisoformat(state['last_run'])).total_seconds() / 3600
+            if elapsed > 0:
+                rate = len(new_urls) / elapsed
+                state['rate'] = rate if state['rate'] is None else self.alpha * rate + (1 - self.alpha) * state['rate']
+        state['last_run'] = now.isoformat()
+
+        upcoming = [start for start in map(parse_start_time, start_times) if start is not None and start > now]
+        state['next_start'] = min(upcoming).isoformat() if upcoming else None
+
+        self.logging.info(f"Cadence {source}: {len(new_urls)} new URLs, rate {state['rate']} per hour, next start {state['next_start']}")
+        try:
+            self.save()
+        except Exception as e:
+            self.logging.error(f"Error saving cadence state {self.state_file}: {e}")
+
+    def next_interval(self, source, now=None):
+        # Seconds until the next run of source
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        state = self.state.get(source)
+        if state is None or state['rate'] is None:
+            interval = self.initial_interval
+        elif state['rate'] <= 0:
+            interval = self.max_interval
+        else:
+            interval = self.target_new_per_run / state['rate'] * 3600
+        interval = min(max(interval, self.min_interval), self.max_interval)
+
+        if state is not None and state['next_start'] is not None:
+            until_start = (datetime.datetime.fromisoformat(state['next_start']) - now).total_seconds() + self.lead_time
+            if 0 < until_start < interval:
+                interval = max(until_start, self.lead_time)
+
+        return int(interval)
@@ -3,6 +3,17 @@ import psycopg2
 import time
 import logging
 
+# Columns added by migrate(), on-chain details of the token and pool
+ONCHAIN_COLUMNS = [
+    ('onchain_verified', 'BOOLEAN'),
+    ('mint_supply', 'NUMERIC(20)'),
+    ('mint_decimals', 'SMALLINT'),
+    ('mint_authority', 'VARCHAR(64)'),
+    ('freeze_authority', 'VARCHAR(64)'),
+    ('pool_balance', 'BIGINT'),
+    ('enriched_at', 'TIMESTAMP'),
+]
+
 class Database:
     def __init__(self, logging, host, port, database, user, password):
         self.host = host
@@ -82,11 +93,51 @@ class Database:
                     scrap_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self.conn.commit()
             self.logging.info("Table 'project_info' created successfully.")
 
         except psycopg2.Error as e:
             self.logging.error("Error: %s", e)
 
+        self.migrate()
+
+    def migrate(self):
+        # Add the columns and indexes introduced after the first deployments of the projects table.
+        # Only the missing ones: ALTER TABLE takes an ACCESS EXCLUSIVE lock even when it changes
+        # nothing, and would queue every reader behind a running export
+        try:
+            self.cur.execute("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'projects'
+            """)
+            columns = {row[0] for row in self.cur.fetchall()}
+
+            # On-chain details of the token and pool, filled by the enrichment stage
+            missing = [(name, column_type) for name, column_type in ONCHAIN_COLUMNS if name not in columns]
+            if missing:
+                self.cur.execute("ALTER TABLE projects " + ", ".join(f"ADD COLUMN {name} {column_type}" for name, column_type in missing))
+                self.logging.info("Added columns to table 'projects': %s", ", ".join(name for name, _ in missing))
+
+            # Last write time of the row, cursor of the incremental export. clock_timestamp() is the time
+            # of the write itself, not the start of a transaction that may have been open for minutes
+            if 'updated_at' not in columns:
+                self.cur.execute("ALTER TABLE projects ADD COLUMN updated_at TIMESTAMP")
+                self.cur.execute("UPDATE projects SET updated_at = scrap_time WHERE updated_at IS NULL")
+                self.cur.execute("ALTER TABLE projects ALTER COLUMN updated_at SET DEFAULT clock_timestamp()")
+                self.logging.info("Added column to table 'projects': updated_at")
+
+            self.cur.execute("SELECT 1 FROM pg_indexes WHERE schemaname = current_schema() AND indexname = 'projects_updated_at_id_idx'")
+            if self.cur.fetchone() is None:
+                self.cur.execute("CREATE INDEX projects_updated_at_id_idx ON projects (updated_at, id)")
+                self.logging.info("Created index projects_updated_at_id_idx")
+
+            self.conn.commit()
+            return True
+        except psycopg2.Error as e:
+            self.conn.rollback()
+            self.logging.error("Error migrating table 'projects': %s", e)
+            return False
+
 
     
 
@@ -98,7 +149,8 @@ class Database:
         return existing_link
 
 
-    def insert_project_data(self, url, data):
+    def insert_project_data(self, url, data, update=False):
+        # update: overwrite the scraped fields of an existing project instead of failing on its url
         # self.cur.execute("INSERT INTO projects (url) VALUES (%s)", (url,))
         # self.conn.commit()
 
@@ -117,7 +169,14 @@ class Database:
                     url,name, symbol, web, twitter, telegram, token_address, supply,
                     pool_address, soft_cap, start_time, end_time, lockup_time, rate, raised
                 ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
+            """ + ("""
+                ON CONFLICT (url) DO UPDATE SET
+                    name = EXCLUDED.name, symbol = EXCLUDED.symbol, web = EXCLUDED.web, twitter = EXCLUDED.twitter,
+                    telegram = EXCLUDED.telegram, token_address = EXCLUDED.token_address, supply = EXCLUDED.supply,
+                    pool_address = EXCLUDED.pool_address, soft_cap = EXCLUDED.soft_cap, start_time = EXCLUDED.start_time,
+                    end_time = EXCLUDED.end_time, lockup_time = EXCLUDED.lockup_time, rate = EXCLUDED.rate,
+                    raised = EXCLUDED.raised, updated_at = clock_timestamp()
+            """ if update else ""), (
                 url, data.name, data.symbol, data.web, data.twitter, data.telegram, data.token_address, data.supply,
                     data.pool_address, data.soft_cap, data.start_time, data.end_time, data.lockup_time, data.rate, data.raised
             ))
@@ -132,6 +191,26 @@ class Database:
             self.conn.rollback()
             self.logging.error("Error while adding record to DB: %s", e)
             return False
+
+    def update_project_onchain(self, url, info):
+        try:
+            self.cur.execute("""
+                UPDATE projects SET
+                    onchain_verified = %s, mint_supply = %s, mint_decimals = %s, mint_authority = %s,
+                    freeze_authority = %s, pool_balance = %s, enriched_at = CURRENT_TIMESTAMP,
+                    updated_at = clock_timestamp()
+                WHERE url = %s
+            """, (
+                info['onchain_verified'], info['mint_supply'], info['mint_decimals'], info['mint_authority'],
+                    info['freeze_authority'], info['pool_balance'], url
+            ))
+            self.conn.commit()
+            return True
+
+        except Exception as e:
+            self.conn.rollback()
+            self.logging.error("Error while adding on-chain info to DB: %s", e)
+            return False
         
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+import os
+import csv
+import gzip
+import json
+import datetime
+
+
+class Exporter:
+    """
+    Incremental export of the projects table to date partitioned files.
+
+    Rows are read after the persisted (updated_at, id) cursor with a server side
+    cursor, batch_size rows at a time, and written to
+    <directory>/projects/date=YYYY-MM-DD/part-<run>-<batch>.(csv.gz|parquet),
+    partitioned by scrap_time. Rows written less than safety_lag seconds ago are
+    left for the next export, so that rows of transactions not yet committed are
+    not skipped. The cursor is saved after every batch, so an interrupted export
+    resumes where it stopped.
+    """
+
+    def __init__(self, logging, db, directory="exports", file_format="csv", batch_size=5000, cursor_file=None, safety_lag=60):
+        self.logging = logging
+        self.db = db
+        self.directory = directory
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.safety_lag = safety_lag
+        self.cursor_file = cursor_file or os.path.join(directory, "projects.cursor.json")
+
+        if file_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unknown export format: {file_format}")
+
+    def load_cursor(self):
+        if not os.path.exists(self.cursor_file):
+            return datetime.datetime(1970, 1, 1), 0
+        with open(self.cursor_file, 'r') as file:
+            cursor = json.load(file)
+        return datetime.datetime.fromisoformat(cursor['updated_at']), cursor['id']
+
+    def save_cursor(self, updated_at, row_id):
+        os.makedirs(os.path.dirname(self.cursor_file) or '.', exist_ok=True)
+        tmp_path = f"{self.cursor_file}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump({'updated_at': updated_at.isoformat(), 'id': row_id}, file)
+        os.replace(tmp_path, self.cursor_file)
+
+    def write_csv(self, path, columns, rows):
+        with gzip.open(path, 'wt', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            writer.writerows(rows)
+
+    def write_parquet(self, path, columns, rows):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("pyarrow is required for the parquet export format")
+        table = pyarrow.Table.from_pylist([dict(zip(columns, row)) for row in rows])
+        pyarrow.parquet.write_table(table, path, compression='zstd')
+
+    def write_batch(self, run_id, batch_number, columns, rows):
+        scrap_time_index = columns.index('scrap_time')
+        partitions = {}
+        for row in rows:
+            partitions.setdefault(row[scrap_time_index].date(), []).append(row)
+
+        extension = 'csv.gz' if self.file_format == 'csv' else 'parquet'
+        for date, partition_rows in partitions.items():
+            partition_directory = os.path.join(self.directory, "projects", f"date={date.isoformat()}")
+            os.makedirs(partition_directory, exist_ok=True)
+            path = os.path.join(partition_directory, f"part-{run_id}-{batch_number:05d}.{extension}")
+            tmp_path = f"{path}.tmp"
+            if self.file_format == 'csv':
+                self.write_csv(tmp_path, columns, partition_rows)
+            else:
+                self.write_parquet(tmp_path, columns, partition_rows)
+            os.replace(tmp_path, path)
+
+    def run(self):
+        # Export the rows after the cursor, returns the number of exported rows
+        updated_at, row_id = self.load_cursor()
+        run_id = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self.logging.info(f"Exporting projects after ({updated_at}, {row_id})")
+
+        exported = 0
+        cur = self.db.conn.cursor(name=f"projects_export_{run_id}")
+        cur.itersize = self.batch_size
+        try:
+            cur.execute("""
+                SELECT * FROM projects
+                WHERE (updated_at, id) > (%s, %s)
+                    AND updated_at < clock_timestamp()::timestamp - %s * INTERVAL '1 second'
+                ORDER BY updated_at, id
+            """, (updated_at, row_id, self.safety_lag))
+
+            batch_number = 0
+            while True:
+                rows = cur.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                columns = [column[0] for column in cur.description]
+                self.write_batch(run_id, batch_number, columns, rows)
+
+                last = rows[-1]
+                self.save_cursor(last[columns.index('updated_at')], last[columns.index('id')])
+                exported += len(rows)
+                batch_number += 1
+                self.logging.info(f"Exported {exported} projects")
+        finally:
+            cur.close()
+            self.db.conn.rollback()
+
+        self.logging.info(f"Export finished, {exported} projects exported to {self.directory}")
+        return exported
+
@@ -0,0 +1,109 @@
+
+# Field maps used to extract TokenData from a project page.
+#
+# Every field is a tuple of (attribute, tag, xpath, extract_type):
+#   attribute    - TokenData attribute the value is stored in
+#   tag          - name used in the logs when the field is missing
+#   xpath        - absolute xpath of the element on the page
+#   extract_type - 'text', 'text_split' (first line), 'text_value' (second line) or 'url'
+#
+# The same maps are used by the live scrappers (Selenium) and by the
+# Reextractor which runs them over archived pages without a browser.
+
+
+PINKSALE_STRATEGY1 = {
+    'live_xpath': "/html/body/div/div/div[3]/main/div/div/div[2]/div[2]/div[1]/div[3]/div[2]/div[2]",
+    'fields': [
+        # Current Rate and Raised
+        ('rate', 'current_rate', "/html/body/div/div/div[3]/main/div/div/div[2]/div[2]/div[1]/div[3]/div[4]/div[2]", 'text'),
+        ('raised', 'current_raised', "/html/body/div/div/div[3]/main/div/div/div[2]/div[2]/div[1]/div[3]/div[5]/div[2]", 'text'),
+
+        # web, twitter and telegram addresses
+        ('web', 'web_address', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[1]", 'url'),
+        ('twitter', 'twitter_address', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[2]", 'url'),
+        ('telegram', 'telegram_address', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[3]", 'url'),
+
+        # Token Address
+        ('token_address', 'token_address', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[2]/div/div[2]/div[2]", 'text_split'),
+
+        # name, symbol, supply
+        ('name', 'name', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[2]/div/div[3]/div[2]", 'text'),
+        ('symbol', 'symbol', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[2]/div/div[4]/div[2]", 'text'),
+        ('supply', 'total_supply', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[2]/div/div[6]/div[2]", 'text'),
+
+        # Pool Address
+        ('pool_address', 'pool_address', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[2]/div[2]", 'text_split'),
+
+        # soft cap
+        ('soft_cap', 'soft_cap', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[5]/div[2]", 'text'),
+
+        # start, end and lock up time
+        ('start_time', 'start_time', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[6]/div[2]", 'text'),
+        ('end_time', 'end_time', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[7]/div[2]", 'text'),
+        ('lockup_time', 'lockup_time', "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[10]/div[2]", 'text'),
+    ],
+}
+
+
+PINKSALE_STRATEGY2 = {
+    'live_xpath': "/html/body/div/div/div[3]/main/div/div/div[1]/div[2]/div[3]/div[2]/div[2]/div",
+    'fields': [
+        # Current Rate and Raised
+        ('rate', 'current_rate', "/html/body/div/div/div[3]/main/div/div/div[1]/div[2]/div[3]/div[5]/div[2]/div", 'text'),
+        ('raised', 'current_raised', "/html/body/div/div/div[3]/main/div/div/div[1]/div[2]/div[3]/div[6]/div[2]/div", 'text'),
+
+        # web, twitter and telegram addresses
+        ('web', 'web_address', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[1]", 'url'),
+        ('twitter', 'twitter_address', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[2]", 'url'),
+        ('telegram', 'telegram_address', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[3]", 'url'),
+
+        # Token Address
+        ('token_address', 'token_address', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[2]/div/div[2]/div[2]/div/div/div[1]", 'text_split'),
+
+        # name, symbol, supply
+        ('name', 'name', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[2]/div/div[3]/div[2]/div", 'text'),
+        ('symbol', 'symbol', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[2]/div/div[4]/div[2]", 'text'),
+        ('supply', 'total_supply', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[2]/div/div[6]/div[2]/div", 'text'),
+
+        # Pool Address
+        ('pool_address', 'pool_address', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[2]/div[2]", 'text_split'),
+
+        # soft cap
+        ('soft_cap', 'soft_cap', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[6]/div[2]", 'text'),
+
+        # start, end and lock up time
+        ('start_time', 'start_time', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[7]/div[2]", 'text'),
+        ('end_time', 'end_time', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[8]/div[2]", 'text'),
+        ('lockup_time', 'lockup_time', "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[12]/div[2]", 'text'),
+    ],
+}
+
+
+# No live status xpath, live_status is the text of the status badge and is
+# mapped to a boolean by the extractors
+SOLANAPAD_STRATEGY1 = {
+    'live_xpath': None,
+    'fields': [
+        ('symbol', 'Symbol', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[1]/div[1]/h3", 'text'),
+        ('live_status', 'Live Status', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[2]/div[2]/span", 'text'),
+        ('web', 'URL', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[1]/div[2]/div/a[1]", 'url'),
+        ('twitter', 'Twitter', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[1]/div[2]/div/a[2]", 'url'),
+        ('telegram', 'Telegram', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[1]/div[2]/div/a[3]", 'url'),
+
+        ('rate', 'Current Rate', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[1]", 'text_value'),
+        ('start_time', 'Start Time', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[2]", 'text_value'),
+        ('end_time', 'End Time', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[3]", 'text_value'),
+        ('soft_cap', 'Soft Cap', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[4]", 'text_value'),
+
+        ('raised', 'Raised', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[2]/div/div[2]/div[3]/div/div/span[1]", 'text_split'),
+        ('token_address', 'Token Address', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[9]/div/span[1]", 'text'),
+        ('pool_address', 'Pool Address', "/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[10]/div/span[1]", 'text'),
+    ],
+}
+
+
+# Field maps tried, in order, for the pages of each source
+FIELD_MAPS = {
+    'pinksale': [PINKSALE_STRATEGY1, PINKSALE_STRATEGY2],
+    'solanapad': [SOLANAPAD_STRATEGY1],
+}
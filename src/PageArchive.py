@@ -0,0 +1,108 @@
+import os
+import json
+import hashlib
+import datetime
+import zstandard
+
+
+class PageArchive:
+    """
+    Content addressed archive of the raw project pages.
+
+    Every page_source is compressed with zstd and stored once under its sha256
+    (objects/ab/abcdef....html.zst). The index (index.jsonl) records, per fetch,
+    the source, URL, fetch time and digest of the page.
+    """
+
+    def __init__(self, logging, directory="archive", level=10):
+        self.logging = logging
+        self.directory = directory
+        self.level = level
+        self.index_path = os.path.join(directory, "index.jsonl")
+        # Directories are created by store() only, reading a missing archive leaves no trace
+        self.objects_directory = os.path.join(directory, "objects")
+
+    @staticmethod
+    def object_path(directory, digest):
+        return os.path.join(directory, "objects", digest[:2], f"{digest}.html.zst")
+
+    @staticmethod
+    def read_object(directory, digest):
+        with open(PageArchive.object_path(directory, digest), 'rb') as file:
+            return zstandard.ZstdDecompressor().decompress(file.read()).decode('utf-8')
+
+    def store(self, source, url, page_source):
+        content = page_source.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(self.directory, digest)
+
+        # Same page content is stored only once
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as file:
+                file.write(zstandard.ZstdCompressor(level=self.level).compress(content))
+            os.replace(tmp_path, path)
+
+        record = {
+            'source': source,
+            'url': url,
+            'fetched_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'sha256': digest,
+            'size': len(content),
+        }
+        with open(self.index_path, 'a') as file:
+            file.write(json.dumps(record) + '\n')
+
+        self.logging.info(f"Archived page {url} ({digest[:12]})")
+        return digest
+
+    def load(self, digest):
+        return self.read_object(self.directory, digest)
+
+    def entries(self, source=None, since=None, url=None):
+        # Iterate the index records, optionally filtered by source, fetch time and URL
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if source is not None and record['source'] != source:
+                    continue
+                if url is not None and record['url'] != url:
+                    continue
+                if since is not None and datetime.datetime.fromisoformat(record['fetched_at']) < since:
+                    continue
+                yield record
+
+    def delete_older_than(self, days):
+        # Drop index records older than the retention and the objects no longer referenced
+        if not os.path.exists(self.index_path):
+            return 0
+
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
+        kept = [record for record in self.entries() if datetime.datetime.fromisoformat(record['fetched_at']) >= cutoff]
+
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as file:
+            for record in kept:
+                file.write(json.dumps(record) + '\n')
+        os.replace(tmp_path, self.index_path)
+
+        referenced = {record['sha256'] for record in kept}
+        deleted = 0
+        for root, _, filenames in os.walk(self.objects_directory):
+            for filename in filenames:
+                digest = filename.split('.')[0]
+                if digest in referenced:
+                    continue
+                try:
+                    os.remove(os.path.join(root, filename))
+                    deleted += 1
+                except Exception as e:
+                    self.logging.error(f"Error deleting archived page {filename}: {e}")
+
+        self.logging.info(f"Deleted {deleted} archived pages older than {days} days")
+        return deleted
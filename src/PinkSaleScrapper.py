@@ -5,10 +5,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from src.BaseScrapper import BaseScrapper
+from src.FieldMaps import PINKSALE_STRATEGY1, PINKSALE_STRATEGY2
 
 class PinkSaleScrapper(BaseScrapper):
-    def __init__(self, logging):
-        super().__init__(logging)
+    source = "pinksale"
+
+    def __init__(self, logging, archive=None):
+        super().__init__(logging, archive=archive)
         self.url = "https://www.pinksale.finance/solana/launchpad"
         #self.elements = None
         self.links = []
@@ -32,6 +35,8 @@ class PinkSaleScrapper(BaseScrapper):
 
         if self.status == True:
             try:                
+                # Links of this run only, the listing is read again on every start
+                self.links = []
                 elements = self.driver.find_elements(By.CLASS_NAME, "flex-1.overflow-x-auto")
                 links = elements[0].find_elements(By.TAG_NAME, 'a')
 
@@ -53,15 +58,29 @@ class PinkSaleScrapper(BaseScrapper):
         return self.links
 
     def extract_token_info(self, proj_url):
+        data = self.match_strategies(proj_url)
+        # Archive the page once per fetch of the project, as loaded by the last strategy,
+        # whatever the extraction result: a broken xpath is what the archive is for
+        self.archive_page(proj_url)
+        return data
+
+    def match_strategies(self, proj_url):
+        # Strategy1 then strategy2, the first layout showing the project as live wins
         data = self.extract_token_info_strategy1(proj_url)
         if data.live_status == True:            
             return data
         
+        first_data = data
         data = self.extract_token_info_strategy2(proj_url)
         if data.live_status == True:
             return data
-        else:
-            return data
+
+        # Not live with either layout, keep what strategy1 found (e.g. the start time of an upcoming project)
+        if first_data.status == True and data.status != True:
+            return first_data
+        if data.start_time is None:
+            data.start_time = first_data.start_time
+        return data
     
 
     # def get_next_project_stats(self):
@@ -136,101 +155,33 @@ class PinkSaleScrapper(BaseScrapper):
         self.sec_driver.implicitly_wait(10)
         return status, live_status
 
-    def extract_token_info_strategy1(self, url):
+    def extract_token_info_strategy(self, url, strategy):
         data = TokenData()
        
         # Open URL and Extract Live Status
-        status, live_status = self.open_sub_url(url=url, xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[2]/div[1]/div[3]/div[2]/div[2]")
+        status, live_status = self.open_sub_url(url=url, xpath=strategy['live_xpath'])
         if status == False:
             return data
         
         data.status = True
         
         if 'live' not in live_status.lower():            
+            # Start time of upcoming projects drives the polling cadence
+            if 'upcoming' in live_status.lower():
+                self.extract_fields(data, [field for field in strategy['fields'] if field[0] == 'start_time'])
             return data
         
         # Set Live Status to True
         data.live_status = True
 
-        # Extract Current Rate 
-        data.rate = super().extract_data( tag="current_rate", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[2]/div[1]/div[3]/div[4]/div[2]")
-        
-        # Extract Current Raised
-        data.raised = super().extract_data( tag="current_raised", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[2]/div[1]/div[3]/div[5]/div[2]")
-        
-        # Extract web, twitter and telegram addresses
-        data.web = super().extract_data(tag="web_address", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[1]", extract_type="url")
-        data.twitter = super().extract_data(tag="twitter_address", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[2]", extract_type="url")
-        data.telegram = super().extract_data(tag="telegram_address", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[3]", extract_type="url")
-
-        # Extract Address
-        data.token_address = super().extract_data(tag="token_address", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[2]/div/div[2]/div[2]", extract_type="text_split")
-
-        # Extract name, symbol, supply
-        data.name = super().extract_data(tag="name", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[2]/div/div[3]/div[2]")
-        data.symbol = super().extract_data(tag="symbol", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[2]/div/div[4]/div[2]")
-        data.supply = super().extract_data(tag="total_supply", xpath="/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[2]/div/div[6]/div[2]")
-
-        # Extract Pool Address
-        data.pool_address = super().extract_data("pool_address", "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[2]/div[2]", extract_type="text_split")
+        # Extract rate, raised, socials, addresses, name, symbol, supply, soft cap and times
+        return self.extract_fields(data, strategy['fields'])
 
-        # Extract soft cap
-        data.soft_cap = super().extract_data("soft_cap", "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[5]/div[2]")
-        
-        # Extract start, end and lock up time
-        data.start_time = super().extract_data("start_time", "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[6]/div[2]")
-        data.end_time = super().extract_data("end_time", "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[7]/div[2]")
-        data.lockup_time = super().extract_data("lockup_time", "/html/body/div/div/div[3]/main/div/div/div[2]/div[1]/div[1]/div[3]/div[10]/div[2]")
-
-        return  data
+    def extract_token_info_strategy1(self, url):
+        return self.extract_token_info_strategy(url, PINKSALE_STRATEGY1)
     
     def extract_token_info_strategy2(self, url):
-        data = TokenData()
-       
-        # Open URL and Extract Live Status
-        status, live_status = self.open_sub_url(url=url, xpath="/html/body/div/div/div[3]/main/div/div/div[1]/div[2]/div[3]/div[2]/div[2]/div")
-        if status == False:
-            return data
-        
-        data.status = True
-        
-        if 'live' not in live_status.lower():            
-            return data
-        
-        # Set Live Status to True
-        data.live_status = True
-
-        # Extract Current Rate 
-        data.rate = super().extract_data( "current_rate", "/html/body/div/div/div[3]/main/div/div/div[1]/div[2]/div[3]/div[5]/div[2]/div")
-        
-        # Extract Current Raised
-        data.raised = super().extract_data( "current_raised", "/html/body/div/div/div[3]/main/div/div/div[1]/div[2]/div[3]/div[6]/div[2]/div")
-        
-        # Extract web, twitter and telegram addresses
-        data.web = super().extract_data("web_address", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[1]", extract_type="url")
-        data.twitter = super().extract_data("twitter_address", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[2]", extract_type="url")
-        data.telegram = super().extract_data("telegram_address", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div[3]/a[3]", extract_type="url")
-
-        # Extract Address
-        data.token_address = super().extract_data("token_address", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[2]/div/div[2]/div[2]/div/div/div[1]", extract_type="text_split")
-
-        # Extract name, symbol, supply
-        data.name = super().extract_data("name", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[2]/div/div[3]/div[2]/div")
-        data.symbol = super().extract_data("symbol", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[2]/div/div[4]/div[2]")
-        data.supply = super().extract_data("total_supply", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[2]/div/div[6]/div[2]/div")
-
-        # Extract Pool Address
-        data.pool_address = super().extract_data("pool_address", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[2]/div[2]", extract_type="text_split")
-
-        # Extract soft cap
-        data.soft_cap = super().extract_data("soft_cap", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[6]/div[2]")
-        
-        # Extract start, end and lock up time
-        data.start_time = super().extract_data("start_time", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[7]/div[2]")
-        data.end_time = super().extract_data("end_time", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[8]/div[2]")
-        data.lockup_time = super().extract_data("lockup_time", "/html/body/div/div/div[3]/main/div/div/div[1]/div[1]/div[1]/div[3]/div[12]/div[2]")
-
-        return  data
+        return self.extract_token_info_strategy(url, PINKSALE_STRATEGY2)
     
 
 
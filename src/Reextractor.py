@@ -0,0 +1,128 @@
+import os
+import re
+from multiprocessing import Pool
+from urllib.parse import urljoin
+from lxml import html
+from src.TokenData import TokenData
+from src.FieldMaps import FIELD_MAPS
+from src.PageArchive import PageArchive
+
+
+# Elements rendered on their own lines, the others are inline
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'dialog', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hgroup', 'hr',
+    'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'tbody', 'thead', 'tfoot', 'tr', 'ul',
+}
+# Elements whose content is never rendered
+HIDDEN_TAGS = {'script', 'style', 'template', 'noscript', 'head'}
+LINE_BREAK = '\x00'
+
+
+def element_text(element):
+    # Approximate the rendered text of Selenium: lines break at block elements and <br>,
+    # whitespace inside inline content collapses to a single space
+    parts = []
+
+    def walk(node):
+        tag = node.tag.lower() if isinstance(node.tag, str) else None
+        if tag is None or tag in HIDDEN_TAGS:
+            return
+        if tag == 'br':
+            parts.append(LINE_BREAK)
+            return
+
+        block = tag in BLOCK_TAGS
+        if block:
+            parts.append(LINE_BREAK)
+        elif tag in ('td', 'th'):
+            parts.append(' ')
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append(LINE_BREAK)
+
+    walk(element)
+    text = re.sub(r'\s+', ' ', ''.join(parts))
+    lines = (line.strip() for line in text.split(LINE_BREAK))
+    return '\n'.join(line for line in lines if line)
+
+
+def extract_html_data(tree, url, xpath, extract_type='text'):
+    elements = tree.xpath(xpath)
+    if not elements:
+        return None
+
+    element = elements[0]
+    if extract_type == 'text':
+        return element_text(element)
+    elif extract_type == 'text_split':
+        return element_text(element).split('\n')[0]
+    elif extract_type == 'text_value':
+        lines = element_text(element).split('\n')
+        return lines[1] if len(lines) > 1 else None
+    elif extract_type == 'url':
+        href = element.get('href')
+        return urljoin(url, href) if href is not None else None
+    return None
+
+
+def extract_html_token_info(page_source, url, strategy):
+    data = TokenData()
+    tree = html.fromstring(page_source)
+
+    if strategy['live_xpath'] is not None:
+        live_status = extract_html_data(tree, url, strategy['live_xpath'])
+        if live_status is None:
+            return data
+
+        data.status = True
+        if 'live' not in live_status.lower():
+            return data
+        data.live_status = True
+    else:
+        data.status = True
+
+    for attribute, tag, xpath, extract_type in strategy['fields']:
+        setattr(data, attribute, extract_html_data(tree, url, xpath, extract_type))
+    if strategy['live_xpath'] is None:
+        # The status is one of the fields, as the text of the status badge
+        data.live_status = data.live_status is not None and 'live' in data.live_status.lower()
+    return data
+
+
+def reextract_record(args):
+    # Worker: run the current field maps of the source over one archived page
+    directory, record = args
+    result = dict(record)
+    try:
+        page_source = PageArchive.read_object(directory, record['sha256'])
+        data = TokenData()
+        for strategy in FIELD_MAPS.get(record['source'], []):
+            data = extract_html_token_info(page_source, record['url'], strategy)
+            if data.live_status == True:
+                break
+        result['data'] = vars(data)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+class Reextractor:
+    def __init__(self, logging, archive, processes=None):
+        self.logging = logging
+        self.archive = archive
+        self.processes = processes or os.cpu_count()
+
+    def run(self, source=None, since=None, url=None, chunksize=16):
+        records = ((self.archive.directory, record) for record in self.archive.entries(source=source, since=since, url=url))
+        with Pool(processes=self.processes) as pool:
+            for result in pool.imap_unordered(reextract_record, records, chunksize=chunksize):
+                if 'error' in result:
+                    self.logging.error(f"Error re-extracting {result['url']}: {result['error']}")
+                yield result
+
@@ -3,31 +3,116 @@ import logging
 import schedule
 from src.PinkSaleScrapper import PinkSaleScrapper
 from src.SolanaPadScrapper import SolanaPadScrapper
+from src.Watchdog import Watchdog, PageTimeout
 class Scheduler:
-    def __init__(self, logging, db):
+    def __init__(self, logging, db, archive=None, enricher=None, watchdog=None, dry_run=False):
         self.db = db
         self.logging = logging
+        # Scrap and log as usual, without writing to the database
+        self.dry_run = dry_run
+        self.enricher = enricher
+        # Hard deadlines per page and per run for the browser calls
+        self.watchdog = watchdog or Watchdog(logging=logging)
+        self.summary = {}
+        self.errors = []
+        # Pages that could not be scraped in the current run
+        self.failed = []
+        # Listing URLs and upcoming start times seen per source in the current run
+        self.source_stats = {}
+        # Projects inserted during the current run, enriched once at the end of the run
+        self.new_projects = []
         # Set up scraper
-        self.pinksale = PinkSaleScrapper(logging=logging)
-        self.solanapad = SolanaPadScrapper(logging=logging)
+        self.pinksale = PinkSaleScrapper(logging=logging, archive=archive)
+        self.solanapad = SolanaPadScrapper(logging=logging, archive=archive)
 
         #self.urls_file = urls_file
 
+    def call(self, scrapper, fn, *args, label=None, **kwargs):
+        # Run a browser call under the watchdog, None if it timed out or failed
+        try:
+            return self.watchdog.call(scrapper, fn, *args, label=label, **kwargs)
+        except PageTimeout as e:
+            self.logging.error("Timeout: %s", e)
+        except Exception as e:
+            self.logging.error("Error at %s: %s", label, e)
+        return None
+
+    def scrape_page(self, scrapper, fn, proj_url, **kwargs):
+        # Extract one project page, None if it failed; one bad page never stops the job
+        if scrapper.get_status() is not True:
+            self.logging.error('No browser session for %s, Skipping URL: %s', scrapper.source, proj_url)
+            self.failed.append(proj_url)
+            return None
+
+        try:
+            return self.watchdog.call(scrapper, fn, label=proj_url, **kwargs)
+        except PageTimeout as e:
+            # Sessions were killed, replace them for the next pages
+            self.logging.error("Timeout: %s", e)
+            if not self.watchdog.run_expired():
+                self.call(scrapper, scrapper.restart_driver, label=f"restart {scrapper.source}")
+        except Exception as e:
+            self.logging.error("Error scrapping URL %s: %s", proj_url, e)
+            self.failed.append(proj_url)
+        return None
+
+    def stop_job(self, scrapper):
+        # Not bound by the run deadline, a run that hit it must still quit its browsers
+        if scrapper.get_Status() is not None:
+            try:
+                self.watchdog.cleanup(scrapper, scrapper.stop_driver, label=f"stop {scrapper.source}")
+            except PageTimeout as e:
+                self.logging.error("Timeout: %s", e)
+            except Exception as e:
+                self.logging.error("Error stopping %s: %s", scrapper.source, e)
+
+    def save_project(self, proj_url, data, update=False):
+        if self.dry_run:
+            self.logging.info('Dry run, not saving: %s %s', proj_url, vars(data))
+            self.new_projects.append((proj_url, data))
+            return
+        if self.db.insert_project_data(proj_url, data, update=update):
+            self.new_projects.append((proj_url, data))
+        else:
+            self.errors.append(f"Error saving {proj_url}")
+
+    def check_page(self, proj_url, data):
+        # Page did not load (or the layout was not recognized), count it as a partial result
+        if data.status != True:
+            self.logging.error('Page could not be scrapped: %s', proj_url)
+            self.failed.append(proj_url)
+
+    def observe_links(self, source, links):
+        self.source_stats.setdefault(source, {'links': [], 'start_times': []})['links'].extend(links)
+
+    def observe_project(self, source, data):
+        if data.live_status != True and data.start_time:
+            self.source_stats.setdefault(source, {'links': [], 'start_times': []})['start_times'].append(data.start_time)
+
     def pinksale_job(self):
         #for url in urls:
-        status = self.pinksale.start_driver()
+        status = self.call(self.pinksale, self.pinksale.start_driver, label=self.pinksale.url)
         
         if status:     
             links = self.pinksale.get_links()
+            self.observe_links('pinksale', links)
             for proj_url in links:                    
+                if self.watchdog.run_expired():
+                    self.logging.error('Run deadline exceeded, Skipping URL: %s', proj_url)
+                    self.watchdog.timed_out.append(proj_url)
+                    continue
                 #proj_url = link.get_attribute('href')
                 #logging.info('URL: %s', link.get_attribute('href'))  # Print the href attribute value of each <a> tag
                 if self.db.check_project_url(proj_url) == False:   
                     self.logging.info('Project seems to be new, Scrapping URL: %s', proj_url)    
-                    data = self.pinksale.extract_token_info(proj_url=proj_url)
+                    data = self.scrape_page(self.pinksale, self.pinksale.extract_token_info, proj_url, proj_url=proj_url)
+                    if data is None:
+                        continue
+                    self.check_page(proj_url, data)
+                    self.observe_project('pinksale', data)
                     if data.live_status == True:
                         self.logging.info('Project is Live, Add Info to DB: %s', proj_url)
-                        self.db.insert_project_data(proj_url, data)
+                        self.save_project(proj_url, data)
                         continue
                     else:
                         self.logging.info('Project is not LIVE, Skipping URL: %s', proj_url)
@@ -36,26 +121,39 @@ class Scheduler:
             
         else:
             self.logging.error("Failed to Initialize scrapper for PinkSale")
+            self.errors.append("Failed to Initialize scrapper for PinkSale")
 
-        if self.pinksale.get_Status():
-            self.pinksale.stop_driver()
+        self.stop_job(self.pinksale)
 
     def solanapad_job(self):
         #for url in urls:
-        status = self.solanapad.start_driver()
+        status = self.call(self.solanapad, self.solanapad.start_driver, label="start solanapad")
         
         if status:     
-            links = self.solanapad.get_links()
+            links = self.call(self.solanapad, self.solanapad.get_links, label="solanapad links")
+            if links is None:
+                self.errors.append("Failed to get the links of SolanaPad")
+                links = []
+            else:
+                self.observe_links('solanapad', links)
             for proj_url in links:                    
+                if self.watchdog.run_expired():
+                    self.logging.error('Run deadline exceeded, Skipping URL: %s', proj_url)
+                    self.watchdog.timed_out.append(proj_url)
+                    continue
                 #proj_url = link.get_attribute('href')
                 #logging.info('URL: %s', link.get_attribute('href'))  # Print the href attribute value of each <a> tag
                 if self.db.check_project_url(proj_url) == False:   
                     self.logging.info('Project seems to be new, Scrapping URL: %s', proj_url)    
                     #data = self.solanapad.extract_data(proj_url=proj_url)
-                    data = self.solanapad.extract_token_info_strategy1(url=proj_url)
+                    data = self.scrape_page(self.solanapad, self.solanapad.extract_token_info_strategy1, proj_url, url=proj_url)
+                    if data is None:
+                        continue
+                    self.check_page(proj_url, data)
+                    self.observe_project('solanapad', data)
                     if data.live_status == True:
                         self.logging.info('Project is Live, Add Info to DB: %s', proj_url)
-                        self.db.insert_project_data(proj_url, data)
+                        self.save_project(proj_url, data)
                         continue
                     else:
                         self.logging.info('Project is not LIVE, Skipping URL: %s', proj_url)
@@ -63,28 +161,126 @@ class Scheduler:
                     self.logging.info('Project already exists, Skipping URL: %s', proj_url)
             
         else:
-            logging.error("Failed to Initialize scrapper for SolanaPad")
+            self.logging.error("Failed to Initialize scrapper for SolanaPad")
+            self.errors.append("Failed to Initialize scrapper for SolanaPad")
 
-        if self.solanapad.get_Status():
-            self.solanapad.stop_driver()
+        self.stop_job(self.solanapad)
             
 
-    def run(self):
+    def enrich_job(self):
+        if self.enricher is None or not self.new_projects:
+            return
+
+        try:
+            enriched = self.enricher.enrich(self.new_projects)
+            for proj_url, info in enriched.items():
+                if self.dry_run:
+                    self.logging.info('Dry run, not saving on-chain info: %s %s', proj_url, info)
+                    continue
+                self.db.update_project_onchain(proj_url, info)
+            self.logging.info("Enriched %d new projects", len(enriched))
+        except Exception as e:
+            self.logging.error("Error enriching new projects: %s", e)
+
+    def scrape_urls(self, urls):
+        # Re-scrap the given project URLs, existing projects are updated
+        self.start_run()
+        try:
+            self.logging.info("Starting Scheduler for %d URLs", len(urls))
+            self.db.connect()
+            self.logging.info("DB Connected")
+
+            scrappers = {
+                'pinksale': (self.pinksale, self.pinksale.extract_token_info, 'proj_url'),
+                'solanapad': (self.solanapad, self.solanapad.extract_token_info_strategy1, 'url'),
+            }
+            for proj_url in urls:
+                source = next((name for name in scrappers if name in proj_url), None)
+                if source is None:
+                    self.logging.error('Unknown source, Skipping URL: %s', proj_url)
+                    self.errors.append(proj_url)
+                    continue
+                if self.watchdog.run_expired():
+                    self.logging.error('Run deadline exceeded, Skipping URL: %s', proj_url)
+                    self.watchdog.timed_out.append(proj_url)
+                    continue
+
+                scrapper, fn, argument = scrappers[source]
+                if scrapper.get_status() is not True:
+                    self.call(scrapper, scrapper.restart_driver, label=f"start {source}")
+
+                self.logging.info('Scrapping URL: %s', proj_url)
+                data = self.scrape_page(scrapper, fn, proj_url, **{argument: proj_url})
+                if data is None:
+                    continue
+                self.check_page(proj_url, data)
+                if data.live_status == True:
+                    self.logging.info('Project is Live, Add Info to DB: %s', proj_url)
+                    self.save_project(proj_url, data, update=True)
+                else:
+                    self.logging.info('Project is not LIVE, Skipping URL: %s', proj_url)
+
+            self.stop_job(self.pinksale)
+            self.stop_job(self.solanapad)
+
+            self.logging.info("Starting On-chain Enrichment")
+            self.enrich_job()
+
+        except Exception as e:
+            self.logging.error("Error occurred: %s", e)
+            self.errors.append(str(e))
+
+        finally:
+            self.finish_run()
+        return self.summary
+
+    def start_run(self):
+        self.new_projects = []
+        self.source_stats = {}
+        self.errors = []
+        self.failed = []
+        self.watchdog.start_run()
+
+    def finish_run(self):
+        self.db.close()
+        self.summary = {
+            'new_projects': len(self.new_projects),
+            'timed_out': list(self.watchdog.timed_out),
+            'failed': list(self.failed),
+            'errors': list(self.errors),
+        }
+        self.logging.info("Run Summary: %d new projects, %d timed out, %d failed, %d errors", self.summary['new_projects'], len(self.summary['timed_out']), len(self.summary['failed']), len(self.summary['errors']))
+        for label in self.summary['timed_out']:
+            self.logging.info("Timed out: %s", label)
+        for label in self.summary['failed']:
+            self.logging.info("Failed: %s", label)
+
+    def run(self, sources=None):
+        # sources: names of the sources to scrap, all of them by default
+        sources = sources or ['solanapad', 'pinksale']
+        self.start_run()
         try:
             self.logging.info("Starting Scheduler")
             self.db.connect()
             self.logging.info("DB Connected")
  
 
-            self.logging.info("Starting SolanaPad Job")
-            self.solanapad_job()
+            if 'solanapad' in sources:
+                self.logging.info("Starting SolanaPad Job")
+                self.solanapad_job()
 
-            self.logging.info("Starting PinkSale Job")
-            self.pinksale_job()
+            if 'pinksale' in sources:
+                self.logging.info("Starting PinkSale Job")
+                self.pinksale_job()
+
+            self.logging.info("Starting On-chain Enrichment")
+            self.enrich_job()
 
         except Exception as e:
             self.logging.error("Error occurred: %s", e)
+            self.errors.append(str(e))
 
         finally:
-            self.db.close()
-            
\ No newline at end of file
+            self.finish_run()
+        return self.summary
+            
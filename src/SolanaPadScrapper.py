@@ -8,10 +8,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from src.BaseScrapper import BaseScrapper
+from src.FieldMaps import SOLANAPAD_STRATEGY1
 
 class SolanaPadScrapper(BaseScrapper):
-    def __init__(self, logging):
-        super().__init__(logging)
+    source = "solanapad"
+
+    def __init__(self, logging, archive=None):
+        super().__init__(logging, archive=archive)
         self.url = None
         self.elements = None
         #self.status = None
@@ -39,20 +42,10 @@ class SolanaPadScrapper(BaseScrapper):
         if status == True:
             
             data.status = True
-            data.symbol = super().extract_data(tag='Symbol', xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[1]/div[1]/h3", extract_type='text')                
-            data.live_status = super().extract_data(tag='Live Status', xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[2]/div[2]/span", extract_type='text')
-            data.web = super().extract_data(tag='URL', xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[1]/div[2]/div/a[1]", extract_type='url')
-            data.twitter = super().extract_data(tag='Twitter', xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[1]/div[2]/div/a[2]", extract_type='url')
-            data.telegram = super().extract_data(tag='Telegram', xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[1]/div[1]/div[2]/div[1]/div[2]/div/a[3]", extract_type='url')
-           
-            data.rate       = super().extract_data(tag="Current Rate\n",      xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[1]", extract_type='text').split('\n')[1]
-            data.start_time  = super().extract_data(tag="Start Time\n", xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[2]", extract_type='text').split('\n')[1]
-            data.end_time    = super().extract_data(tag="End Time\n",   xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[3]", extract_type='text').split('\n')[1]
-            data.soft_cap    = super().extract_data(tag="Soft Cap\n",   xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[4]", extract_type='text').split('\n')[1]
-            
-            data.raised = super().extract_data(tag="\n", xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[2]/div/div[2]/div[3]/div/div/span[1]", extract_type='text_split').split('\n')[0]   
-            data.token_address = super().extract_data(tag="Token Address\n", xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[9]/div/span[1]", extract_type='text')
-            data.pool_address = super().extract_data(tag="Pool Address\n", xpath="/html/body/div/div[1]/div[2]/main/div/div[2]/div[2]/div[1]/div[2]/ul/li[10]/div/span[1]", extract_type='text')
+            self.archive_page(url)
+            self.extract_fields(data, SOLANAPAD_STRATEGY1['fields'])
+            # The status badge is text (e.g. "Live", "Upcoming"), only live projects are saved
+            data.live_status = data.live_status is not None and 'live' in data.live_status.lower()
         return data
             
     def get_Status(self):
@@ -60,6 +53,8 @@ class SolanaPadScrapper(BaseScrapper):
     
     def get_links(self):
         url = "https://solanapad.io/launchpad-list"
+        # Links of this run only
+        self.links = []
         super().start_driver()
         self.driver.get(url)
 
@@ -97,10 +92,10 @@ class SolanaPadScrapper(BaseScrapper):
                 self.links.append(link)
             
             # Process the element here (e.g., scrape its text or attributes)
-            print("Element", 0, "text:", element.text)
+            self.logging.debug("Element 0 text: %s", element.text)
         except:
             # If the element is not found, break the loop
-            print('Exception accessing 0th element')
+            self.logging.debug('Exception accessing 0th element')
 
         # Loop through a range of numbers to generate XPaths dynamically
         for i in range(1, 100):  # Assuming a maximum of 100 entries, adjust as needed
@@ -120,7 +115,7 @@ class SolanaPadScrapper(BaseScrapper):
                     self.links.append(link)
                 
                 # Process the element here (e.g., scrape its text or attributes)
-                print("Element", i, "text:", element.text)
+                self.logging.debug("Element %d text: %s", i, element.text)
             except:
                 # If the element is not found, break the loop
                 break
@@ -0,0 +1,49 @@
+import json
+import urllib.request
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def is_solana_address(address):
+    # A Solana address is the base58 encoding of a 32 byte public key
+    if not address or not 32 <= len(address) <= 44:
+        return False
+    value = 0
+    for char in address:
+        index = BASE58_ALPHABET.find(char)
+        if index < 0:
+            return False
+        value = value * 58 + index
+    leading_zeros = len(address) - len(address.lstrip('1'))
+    return leading_zeros + (value.bit_length() + 7) // 8 == 32
+
+
+class SolanaRpc:
+    def __init__(self, logging, url, timeout=10, batch_size=100):
+        self.logging = logging
+        self.url = url
+        self.timeout = timeout
+        # getMultipleAccounts accepts at most 100 addresses per call
+        self.batch_size = min(batch_size, 100)
+        self.request_id = 0
+
+    def call(self, method, params):
+        self.request_id += 1
+        payload = json.dumps({'jsonrpc': '2.0', 'id': self.request_id, 'method': method, 'params': params}).encode('utf-8')
+        request = urllib.request.Request(self.url, data=payload, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read().decode('utf-8'))
+        if 'error' in body:
+            raise RuntimeError(f"RPC error on {method}: {body['error']}")
+        return body['result']
+
+    def get_multiple_accounts(self, addresses):
+        # Returns {address: account or None}, one getMultipleAccounts call per batch
+        accounts = {}
+        addresses = list(addresses)
+        for i in range(0, len(addresses), self.batch_size):
+            batch = addresses[i:i + self.batch_size]
+            result = self.call('getMultipleAccounts', [batch, {'encoding': 'jsonParsed', 'commitment': 'confirmed'}])
+            accounts.update(zip(batch, result['value']))
+            self.logging.info(f"Fetched {len(batch)} accounts from {self.url}")
+        return accounts
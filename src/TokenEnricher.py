@@ -0,0 +1,134 @@
+import time
+import threading
+from collections import OrderedDict
+from src.SolanaRpc import SolanaRpc, is_solana_address
+
+
+class TtlCache:
+    """
+    LRU cache whose entries expire after ttl seconds.
+
+    get_many coalesces requests: keys already being loaded by another caller
+    are waited for instead of being requested a second time.
+    """
+
+    def __init__(self, max_size=10000, ttl=600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self._get(key)
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key, value):
+        with self.lock:
+            self._set(key, value)
+
+    def _set(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_many(self, keys, loader):
+        # Returns {key: value}, calling loader(missing_keys) -> {key: value} once for the missing keys
+        results = {}
+        to_load = []
+        to_wait = {}
+        with self.lock:
+            for key in dict.fromkeys(keys):
+                entry = self._get(key)
+                if entry is not None:
+                    results[key] = entry[1]
+                elif key in self.in_flight:
+                    to_wait[key] = self.in_flight[key]
+                else:
+                    self.in_flight[key] = threading.Event()
+                    to_load.append(key)
+
+        if to_load:
+            loaded = {}
+            try:
+                loaded = loader(to_load)
+            finally:
+                with self.lock:
+                    for key in to_load:
+                        if key in loaded:
+                            self._set(key, loaded[key])
+                        self.in_flight.pop(key).set()
+            results.update((key, loaded.get(key)) for key in to_load)
+
+        for key, event in to_wait.items():
+            event.wait()
+            entry = self.get(key)
+            results[key] = entry[1] if entry is not None else None
+
+        return results
+
+
+class TokenEnricher:
+    def __init__(self, logging, rpc_url, cache_size=10000, cache_ttl=600, timeout=10):
+        self.logging = logging
+        self.rpc = SolanaRpc(logging=logging, url=rpc_url, timeout=timeout)
+        self.cache = TtlCache(max_size=cache_size, ttl=cache_ttl)
+
+    def enrich(self, projects):
+        # projects: [(url, TokenData)] -> {url: on-chain info} resolved with batched account lookups
+        addresses = []
+        for url, data in projects:
+            for address in (data.token_address, data.pool_address):
+                if is_solana_address(address):
+                    addresses.append(address)
+                elif address:
+                    self.logging.info(f"Skipping invalid Solana address {address} of {url}")
+
+        if not addresses:
+            return {}
+
+        accounts = self.cache.get_many(addresses, self.rpc.get_multiple_accounts)
+
+        enriched = {}
+        for url, data in projects:
+            info = self.parse_mint(accounts.get(data.token_address))
+            pool = accounts.get(data.pool_address)
+            info['pool_balance'] = pool['lamports'] if pool else None
+            enriched[url] = info
+        return enriched
+
+    @staticmethod
+    def parse_mint(account):
+        info = {
+            'onchain_verified': False,
+            'mint_supply': None,
+            'mint_decimals': None,
+            'mint_authority': None,
+            'freeze_authority': None,
+        }
+        try:
+            parsed = account['data']['parsed']
+        except (TypeError, KeyError):
+            return info
+        if parsed.get('type') != 'mint':
+            return info
+
+        mint = parsed['info']
+        info['onchain_verified'] = True
+        info['mint_supply'] = mint.get('supply')
+        info['mint_decimals'] = mint.get('decimals')
+        info['mint_authority'] = mint.get('mintAuthority')
+        info['freeze_authority'] = mint.get('freezeAuthority')
+        return info
@@ -0,0 +1,126 @@
+import os
+import time
+import signal
+import threading
+
+
+class PageTimeout(Exception):
+    pass
+
+
+def child_pids(pid):
+    # Direct children of pid, read from /proc (Linux only)
+    children = []
+    if not os.path.isdir('/proc'):
+        return children
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as file:
+                stat = file.read()
+            # The process name may contain spaces, ppid is the second field after it
+            ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+def kill_process_tree(pid):
+    # Kill the children (e.g. Firefox) before their parent (geckodriver)
+    for child in child_pids(pid):
+        kill_process_tree(child)
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class Watchdog:
+    """
+    Runs browser calls with a hard wall-clock deadline enforced from outside the call.
+
+    A call still running after the page deadline (or the remaining time of the run)
+    is abandoned, the geckodriver and Firefox processes of the scrapper are killed
+    and PageTimeout is raised. The abandoned call is bound to the killed sessions
+    and fails with SessionExpired as soon as it touches the scrapper again.
+    Timed out labels are kept for the run summary. Cleanup calls (quitting the
+    sessions) are bounded by the page deadline only, so that they still run once
+    the run deadline has passed.
+    """
+
+    def __init__(self, logging, page_deadline=180, run_deadline=3000):
+        self.logging = logging
+        self.page_deadline = page_deadline
+        self.run_deadline = run_deadline
+        self.run_started = time.monotonic()
+        self.timed_out = []
+
+    def start_run(self):
+        self.run_started = time.monotonic()
+        self.timed_out = []
+
+    def remaining(self):
+        return self.run_deadline - (time.monotonic() - self.run_started)
+
+    def run_expired(self):
+        return self.remaining() <= 0
+
+    def call(self, scrapper, fn, *args, label=None, **kwargs):
+        label = label or getattr(fn, '__name__', str(fn))
+        timeout = min(self.page_deadline, self.remaining())
+        if timeout <= 0:
+            self.timed_out.append(label)
+            raise PageTimeout(f"Run deadline exceeded before {label}")
+
+        try:
+            return self.run_call(scrapper, fn, args, kwargs, label, timeout)
+        except PageTimeout:
+            self.timed_out.append(label)
+            raise
+
+    def cleanup(self, scrapper, fn, *args, label=None, **kwargs):
+        # Quit calls run after the run deadline too, bounded by the page deadline only,
+        # a wedged quit kills the processes instead
+        label = label or getattr(fn, '__name__', str(fn))
+        return self.run_call(scrapper, fn, args, kwargs, label, self.page_deadline)
+
+    def run_call(self, scrapper, fn, args, kwargs, label, timeout):
+        result = {}
+
+        def target():
+            try:
+                # Once abandoned, the call can not drive the sessions started after it
+                scrapper.bind_session()
+                result['value'] = fn(*args, **kwargs)
+            except BaseException as e:
+                result['error'] = e
+
+        # Daemon thread, so that a call which never returns does not block the exit
+        thread = threading.Thread(target=target, name=f"watchdog-{label}", daemon=True)
+        thread.start()
+        thread.join(timeout)
+
+        if thread.is_alive():
+            self.logging.error(f"Deadline of {timeout:.0f}s exceeded at {label}, killing the browser sessions")
+            self.kill(scrapper)
+            raise PageTimeout(f"Deadline of {timeout:.0f}s exceeded at {label}")
+
+        if 'error' in result:
+            raise result['error']
+        return result.get('value')
+
+    def kill(self, scrapper):
+        # Kill the wedged geckodriver/Firefox processes, the scrapper starts new ones on next use
+        for driver in (scrapper.driver, scrapper.sec_driver):
+            try:
+                process = driver.service.process
+            except AttributeError:
+                continue
+            if process is not None:
+                kill_process_tree(process.pid)
+                self.logging.info(f"Killed browser session (geckodriver pid {process.pid})")
+
+        scrapper.expire_sessions()